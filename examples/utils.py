@@ -22,6 +22,11 @@ def gen_example_query(tokenizer):
 def display_search_results(corpus, queries: Dict, results: Dict):
     pprint_batch(results)
     print(get_console_separator())
+
+    # fetch all the retrieved documents at once
+    flat_row_idxs = [int(i) for row_idxs in results["document.row_idx"] for i in row_idxs]
+    documents = iter(corpus[flat_row_idxs]["document.text"])
+
     for idx, (qst, row_idxs, scores, tokens) in enumerate(
         zip(
             queries["question.text"],
@@ -32,8 +37,8 @@ def display_search_results(corpus, queries: Dict, results: Dict):
     ):
         print(get_console_separator("-"))
         rich.print(f"#{idx}: [magenta]{qst}")
-        for i, row_idx in enumerate(row_idxs):
+        for i, _ in enumerate(row_idxs):
             rich.print(f"# index={i}")
-            print(corpus[row_idx]["document.text"].strip())
+            print(next(documents).strip())
             print(tokens[i])
             print(scores[i])
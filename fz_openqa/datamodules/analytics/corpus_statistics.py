@@ -7,6 +7,7 @@ from typing import Optional
 
 from datasets import Dataset
 from datasets import Split
+from warp_pipes.support.datasets_utils import keep_only_columns
 
 from .base import Analytic
 
@@ -24,16 +25,19 @@ class ReportCorpusStatistics(Analytic):
         """
         Report on a specific split of the dataset.
         """
+        # drop unused columns
+        dset = keep_only_columns(dset, ["document.text", "document.idx"])
+
         documents_ids = Counter()
         n_tokens = 0
         vocab = set()
         for i in range(0, len(dset), self.batch_size):
             batch = dset[i : i + self.batch_size]
-            paragraphs = batch["document.text"]
             documents_ids.update(batch["document.idx"])
-            tokens = [token for doc in paragraphs for token in doc.split()]
-            n_tokens += len(tokens)
-            vocab |= set(tokens)
+            for doc in batch["document.text"]:
+                tokens = doc.split()
+                n_tokens += len(tokens)
+                vocab.update(tokens)
 
         n_documents = len(documents_ids)
         n_paragraphs = len(dset)
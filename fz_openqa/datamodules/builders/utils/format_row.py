@@ -2,6 +2,7 @@ from copy import copy
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Tuple
 
 import torch
 from warp_pipes import get_console_separator
@@ -86,6 +87,12 @@ def get(row: Dict[str, Any], key: str, *i: int, default=None) -> Any:
     return x
 
 
+def count_match_labels(match_score: Any) -> Tuple[int, int]:
+    """Count the positive (`match_score > 0`) and negative (`match_score == 0`) documents."""
+    match_score = torch.as_tensor(match_score)
+    return int((match_score > 0).sum()), int((match_score == 0).sum())
+
+
 def format_row_flat_questions_with_docs(
     row: Dict[str, Any],
     *,
@@ -103,8 +110,8 @@ def format_row_flat_questions_with_docs(
     repr += get_console_separator("-") + "\n"
     repr += f"* Documents: n={len(row['document.input_ids'])}"
     if "document.match_score" in row:
-        repr += f", n_positive={sum(row['document.match_score'] > 0)}, "
-        f"n_negative={sum(row['document.match_score'] == 0)}\n"
+        n_positive, n_negative = count_match_labels(row["document.match_score"])
+        repr += f", n_positive={n_positive}, n_negative={n_negative}"
     repr += "\n"
     for j in range(min(len(row["document.input_ids"]), max_documents)):
         repr += get_console_separator(".") + "\n"
@@ -175,10 +182,8 @@ def repr_documents(row, locator, max_documents: int = 3, **decode_kwargs) -> str
     repr += get_console_separator(".") + "\n"
     repr += f"|-* Q#{locator} - Documents: n={len(row['document.input_ids'])}"
     if "document.match_score" in row:
-        repr += (
-            f", n_positive={sum(row['document.match_score'] > 0)}, "
-            f"n_negative={sum(row['document.match_score'] == 0)}"
-        )
+        n_positive, n_negative = count_match_labels(row["document.match_score"])
+        repr += f", n_positive={n_positive}, n_negative={n_negative}"
     repr += "\n"
     # for each document
     for j in range(min(len(row["document.input_ids"]), max_documents)):
@@ -63,7 +63,7 @@ class DataModule(LightningDataModule):
         eval_batch_size: int = 128,
         num_workers: int = 2,
         pin_memory: bool = True,
-        persistent_workers: bool = False,
+        persistent_workers: Optional[bool] = None,
         drop_last: bool = False,
         **kwargs,
     ):
@@ -77,6 +77,9 @@ class DataModule(LightningDataModule):
         self.eval_batch_size = eval_batch_size
         self.num_workers = num_workers
         self.pin_memory = pin_memory
+        # keep workers alive across epochs, unless specified otherwise
+        if persistent_workers is None:
+            persistent_workers = num_workers > 0
         self.persistent_workers = persistent_workers
         self.drop_last = drop_last
 
@@ -127,7 +130,7 @@ class DataModule(LightningDataModule):
             batch_size=self.train_batch_size,
             num_workers=self.num_workers,
             pin_memory=self.pin_memory,
-            persistent_workers=self.persistent_workers,
+            persistent_workers=self.persistent_workers and self.num_workers > 0,
             drop_last=self.drop_last,
             shuffle=shuffle,
             collate_fn=collate_fn,
@@ -147,6 +150,8 @@ class DataModule(LightningDataModule):
             "collate_fn": collate_fn,
         }
         args.update(kwargs)
+        if args["num_workers"] == 0:
+            args["persistent_workers"] = False
 
         return DataLoader(
             dataset=self.get_dataset(split),
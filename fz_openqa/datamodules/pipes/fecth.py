@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from itertools import chain
+from typing import Any
 from typing import List
 from typing import Optional
 
+import numpy as np
 from datasets import Dataset
+from torch import Tensor
 from warp_pipes import ApplyAsFlatten
 from warp_pipes import Batch
 from warp_pipes import Collate
 from warp_pipes import In
 from warp_pipes import Pipe
 
+from fz_openqa.datamodules.pipes.sorting import reindex
 from fz_openqa.utils.arrays import concat_arrays
 
 
@@ -33,6 +38,7 @@ class FetchDocuments(Pipe):
         index_key: str = "document.row_idx",
         id: str = "fetch-documents-pipe",
         max_chunk_size: int = 500,
+        min_slice_length: int = 64,
         **kwargs,
     ):
         """
@@ -50,6 +56,9 @@ class FetchDocuments(Pipe):
             The id of the pipe.
         max_chunk_size
             The maximum number of rows to fetch at once.
+        min_slice_length
+            The minimum length of a run of consecutive indexes to be read using a slice,
+            shorter runs are fetched together with the other indexes.
         kwargs
             Additional keyword arguments to pass to the collate pipe.
         """
@@ -65,36 +74,39 @@ class FetchDocuments(Pipe):
         self.collate_pipe = collate_pipe or Collate()
         self.index_key = index_key
         self.max_chunk_size = max_chunk_size
+        self.min_slice_length = min_slice_length
 
     def output_keys(self, input_keys: List[str]) -> List[str]:
         return self.corpus_dataset.column_names
 
     def _call_batch(self, batch: Batch, **kwargs) -> Batch:
-        # todo: check dataset fingerprint (checking 1st index for now)
+        # todo: check dataset fingerprint (checking the returned indexes for now)
 
         # get the `dataset` indexes
-        # todo: query dataset for unique indexes only (torch.unique)
-        indexes = [int(idx) for idx in batch[self.index_key]]
+        indexes = np.asarray(batch[self.index_key], dtype=np.int64)
 
         if len(indexes) == 0:
             return {}
 
-        rows = self._fetch_rows(indexes, max_chunk_size=self.max_chunk_size)
+        # fetch each unique row only once, and map back to the query using `inverse`
+        unique_indexes, inverse = np.unique(indexes, return_inverse=True)
+        rows = self._fetch_rows(unique_indexes.tolist(), max_chunk_size=self.max_chunk_size)
         new_indexes = rows[self.index_key]
-        if len(new_indexes) != len(indexes):
+        if len(new_indexes) != len(unique_indexes):
             raise ValueError(
                 f"The number of returned rows does not match with the input index. "
-                f"Retrieved {len(new_indexes)} indexes, expected {len(indexes)}."
+                f"Retrieved {len(new_indexes)} indexes, expected {len(unique_indexes)}."
             )
 
-        no_neg_indices = [i for i in range(len(indexes)) if indexes[i] >= 0]
-        if new_indexes[no_neg_indices[0]] != indexes[no_neg_indices[0]]:
+        no_neg = unique_indexes >= 0
+        if not np.array_equal(np.asarray(new_indexes)[no_neg], unique_indexes[no_neg]):
             raise ValueError(
                 f"The retrieved indices do not matched the query indicies. "
                 f"First 10 retrieved indexes: {new_indexes[:10]}. "
-                f"First 10 query indexes: {indexes[:10]}. "
+                f"First 10 query indexes: {unique_indexes[:10]}. "
                 f"Try using a smaller batch size."
             )
+        rows = {k: reindex(v, inverse) for k, v in rows.items()}
 
         # collate and return
         if isinstance(rows, dict):
@@ -109,22 +121,61 @@ class FetchDocuments(Pipe):
         Notes
         -----
         `Dataset.select` fails when the index is too large. Chunk the indexes to avoid this issue.
+        Long runs (>= `min_slice_length`) of consecutive (non-negative) indexes are read using
+        slices, which results in sequential reads of the Arrow table. The remaining indexes
+        are gathered by chunks.
         """
-
-        rows = None
-        # fetch documents
-        for i in range(0, len(indexes), max_chunk_size):
-            index_i = indexes[i : i + max_chunk_size]
-            batch = self.corpus_dataset[index_i]
-            if rows is None:
-                rows = batch
+        indexes = np.asarray(indexes, dtype=np.int64)
+        order = np.argsort(indexes, kind="stable")
+        sorted_indexes = indexes[order]
+
+        # split the sorted indexes into runs of consecutive values
+        runs = np.split(np.arange(len(indexes)), np.flatnonzero(np.diff(sorted_indexes) != 1) + 1)
+
+        # fetch documents: slices for the runs, chunked lists for the other indexes.
+        # `positions` tracks the position (in `sorted_indexes`) of each fetched row.
+        chunks, positions, scattered = [], [], []
+        for run in runs:
+            if len(run) >= max(2, self.min_slice_length) and sorted_indexes[run[0]] >= 0:
+                for i in range(0, len(run), max_chunk_size):
+                    run_i = run[i : i + max_chunk_size]
+                    start, end = int(sorted_indexes[run_i[0]]), int(sorted_indexes[run_i[-1]])
+                    chunks.append(self.corpus_dataset[start : end + 1])
+                    positions.append(run_i)
             else:
-                for k, v in batch.items():
-                    rows[k] = concat_arrays(rows[k], v)
+                scattered.extend(run.tolist())
+        for i in range(0, len(scattered), max_chunk_size):
+            pos_i = np.asarray(scattered[i : i + max_chunk_size], dtype=np.int64)
+            chunks.append(self.corpus_dataset[sorted_indexes[pos_i].tolist()])
+            positions.append(pos_i)
+
+        # concatenate all chunks at once
+        if len(chunks) == 1:
+            rows = chunks[0]
+        else:
+            rows = {k: _concat_chunks([chunk[k] for chunk in chunks]) for k in chunks[0].keys()}
+
+        # map the fetched rows back to the order of the query `indexes`
+        query_positions = order[np.concatenate(positions)] if len(positions) else order
+        if not np.array_equal(query_positions, np.arange(len(indexes))):
+            index = np.argsort(query_positions)
+            rows = {k: reindex(v, index) for k, v in rows.items()}
 
         return rows
 
 
+def _concat_chunks(values: List[Any]) -> Any:
+    """Concatenate the values of a column fetched in several chunks. Formatted datasets
+    (e.g. "torch") return either a stacked array or a list of rows depending on the shapes
+    of the rows in each chunk, so fall back to a list of rows when the chunks are not
+    compatible arrays."""
+    if all(isinstance(v, (Tensor, np.ndarray)) for v in values):
+        arr_type = type(values[0])
+        if all(isinstance(v, arr_type) and v.shape[1:] == values[0].shape[1:] for v in values):
+            return concat_arrays(*values)
+    return list(chain.from_iterable(list(v) for v in values))
+
+
 class FetchNestedDocuments(ApplyAsFlatten):
     """Retrieve the full document rows (text, input_ids, ...) from
     the corpus object given the input `index_key` for nested documents ([[input_ids]])"""
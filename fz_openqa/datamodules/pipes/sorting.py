@@ -1,5 +1,6 @@
 from typing import Any
 from typing import List
+from typing import Optional
 from typing import Tuple
 from typing import Union
 
@@ -35,6 +36,11 @@ class Sort(Pipe):
     def _call_batch(self, batch: Batch, **kwargs) -> Batch:
         self._check_input_keys(batch)
 
+        # numerical keys: sort with a single `np.lexsort`
+        index = self._lexsort_index(batch)
+        if index is not None:
+            return {k: reindex(v, index) for k, v in batch.items()}
+
         # get values and index
         values = zip(*(batch[key] for key in self.keys))
         indexed_values = [(i, values) for i, values in enumerate(values)]
@@ -49,6 +55,31 @@ class Sort(Pipe):
 
         return {k: reindex(v, index) for k, v in batch.items()}
 
+    def _lexsort_index(self, batch: Batch) -> Optional[np.ndarray]:
+        """Return the sorting index using `np.lexsort` if all keys are 1D numerical values,
+        return None otherwise. Both `np.lexsort` and `sorted` are stable, so the
+        resulting order is the same as the one of the pure Python implementation."""
+        values = []
+        for key in self.keys:
+            v = batch[key]
+            if isinstance(v, Tensor):
+                v = v.detach().cpu()
+            try:
+                v = np.asarray(v)
+            except (ValueError, TypeError, RuntimeError):
+                return None
+            if v.ndim != 1 or v.dtype.kind not in "biuf":
+                return None
+            if v.dtype.kind == "b":
+                v = v.astype(np.int8)
+            if self.reverse:
+                # `~v` reverses the order of (signed and unsigned) integers without overflow
+                v = -v if v.dtype.kind == "f" else ~v
+            values.append(v)
+
+        # `np.lexsort` uses the last key as primary key
+        return np.lexsort(values[::-1])
+
     def _check_input_keys(self, batch):
         for key in self.keys:
             assert key in batch.keys(), f"key={key} not in batch with keys={list(batch.keys())}"
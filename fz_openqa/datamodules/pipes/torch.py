@@ -68,7 +68,10 @@ class Forward(Pipe):
 
         # move data to device
         if isinstance(self.model, torch.nn.Module):
-            device = next(iter(self.model.parameters())).device
+            # LightningModule and HF models expose `device`, avoid iterating the parameters
+            device = getattr(self.model, "device", None)
+            if not isinstance(device, torch.device):
+                device = next(iter(self.model.parameters())).device
             batch = move_data_to_device(batch, device)
 
         # process with the model (Dense or Sparse)
@@ -1,12 +1,11 @@
 import warnings
-from dataclasses import dataclass
 from typing import Any
 from typing import Dict
+from typing import NamedTuple
 from typing import Optional
 from typing import Tuple
 
 import torch
-import torch.nn.functional as F
 from torch import Tensor
 from warp_pipes import pprint_batch
 
@@ -17,8 +16,7 @@ from fz_openqa.modeling.gradients.utils import kl_divergence
 from fz_openqa.utils.functional import batch_reduce
 
 
-@dataclass
-class Quantities:
+class Quantities(NamedTuple):
     """A small helper class to store the different terms involved in evaluating
     the likelihood."""
 
@@ -48,7 +46,7 @@ class InBatchGradients(Gradients):
         # highest `retriever_score``
         if eval_topk is not None and retriever_score.shape[-1] > eval_topk:
             warnings.warn(f"Truncating scores {retriever_score.shape} to topk={eval_topk}")
-            idx = torch.argsort(retriever_score, dim=-1, descending=True)[..., :eval_topk]
+            idx = torch.topk(retriever_score, eval_topk, dim=-1).indices
             retriever_score = retriever_score.gather(index=idx, dim=-1)
             reader_score = reader_score.gather(index=idx, dim=-1)
 
@@ -61,26 +59,27 @@ class InBatchGradients(Gradients):
         )
         # partial answer log-likelihood `\log p(a | q, D[\sigma], A)` for `\sigma \in S(M)`
         logp_a__d = expanded_reader_score.log_softmax(dim=1)
-        targets_ = targets.expand(-1, expanded_reader_score.shape[2])
-        logp_a_star__d = -F.cross_entropy(logp_a__d, targets_, reduction="none")
+        # `logp_a__d` is already normalized: gather the target log-probabilities directly
+        targets_ = targets[:, :, None].expand(-1, 1, logp_a__d.shape[2])
+        logp_a_star__d = logp_a__d.gather(dim=1, index=targets_).squeeze(1)
 
         # document log-likelihood `\log p(\sigma(d_j) | a_j, q_j)`
         normalizer = retriever_score.logsumexp(dim=2, keepdim=True)
         log_p_d__a = expanded_retriever_score - normalizer
         log_p_d__a_no_perm = retriever_score.log_softmax(dim=2)
 
-        pprint_batch(
-            {
-                "retriever_score": retriever_score,
-                "reader_score": reader_score,
-                "expanded_reader_score": expanded_reader_score,
-                "expanded_retriever_score": expanded_retriever_score,
-                "log_p_d__a": log_p_d__a,
-                "log_p_d__a_no_perm": log_p_d__a_no_perm,
-            },
-            "base_quantities_2",
-            silent=not debug,
-        )
+        if debug:
+            pprint_batch(
+                {
+                    "retriever_score": retriever_score,
+                    "reader_score": reader_score,
+                    "expanded_reader_score": expanded_reader_score,
+                    "expanded_retriever_score": expanded_retriever_score,
+                    "log_p_d__a": log_p_d__a,
+                    "log_p_d__a_no_perm": log_p_d__a_no_perm,
+                },
+                "base_quantities_2",
+            )
 
         # answer log-likelihood: `\log p(a_\star | q, A)` (in-batch approximation)
         logp_a = (logp_a__d + log_p_d__a.sum(dim=1, keepdim=True)).logsumexp(dim=2)
@@ -11,6 +11,7 @@ from torch import Tensor
 from transformers import PreTrainedTokenizerFast
 
 from fz_openqa.modeling.heads.dpr import DprHead
+from fz_openqa.modeling.heads.dpr import neg_euclidean_distance
 from fz_openqa.modeling.modules.utils.utils import gen_preceding_mask
 from fz_openqa.utils.metric_type import MetricType
 
@@ -105,9 +106,14 @@ class ColbertHead(DprHead):
                 if self.metric_type == MetricType.inner_product:
                     scores = einsum("buh, bdvh -> bduv", hq, hd)
                 elif self.metric_type == MetricType.euclidean:
-                    _hq = hq[:, None, :, None, :]
-                    _hd = hd[:, :, None, :, :]
-                    scores = -1 * (_hq - _hd).pow(2).sum(-1).pow(0.5)
+                    # the norm expansion is not accurate in half precision: compute in float32
+                    with torch.autocast(device_type=hq.device.type, enabled=False):
+                        _hq, _hd = hq.float(), hd.float()
+                        scores = einsum("buh, bdvh -> bduv", _hq, _hd)
+                        hq_sq_norm = _hq.pow(2).sum(-1)[:, None, :, None]
+                        hd_sq_norm = _hd.pow(2).sum(-1)[:, :, None, :]
+                        scores = neg_euclidean_distance(scores, hq_sq_norm, hd_sq_norm)
+                    scores = scores.to(hq.dtype)
                 else:
                     raise ValueError(f"Unknown `metric_type`: {self.metric_type}")
 
@@ -117,9 +123,14 @@ class ColbertHead(DprHead):
                 if self.metric_type == MetricType.inner_product:
                     scores = einsum("buh, dvh -> bduv", hq, hd)
                 elif self.metric_type == MetricType.euclidean:
-                    _hq = hq[:, None, :, None, :]
-                    _hd = hd[None, :, None, :, :]
-                    scores = -1 * (_hq - _hd).pow(2).sum(-1).pow(0.5)
+                    # the norm expansion is not accurate in half precision: compute in float32
+                    with torch.autocast(device_type=hq.device.type, enabled=False):
+                        _hq, _hd = hq.float(), hd.float()
+                        scores = einsum("buh, dvh -> bduv", _hq, _hd)
+                        hq_sq_norm = _hq.pow(2).sum(-1)[:, None, :, None]
+                        hd_sq_norm = _hd.pow(2).sum(-1)[None, :, None, :]
+                        scores = neg_euclidean_distance(scores, hq_sq_norm, hd_sq_norm)
+                    scores = scores.to(hq.dtype)
                 else:
                     raise ValueError(f"Unknown `metric_type`: {self.metric_type}")
 
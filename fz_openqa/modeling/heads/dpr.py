@@ -8,7 +8,6 @@ from typing import Optional
 import rich
 import torch
 import torch.nn.functional as F
-from torch import einsum
 from torch import nn
 from torch import Tensor
 
@@ -40,6 +39,14 @@ def unique_with_indices(x, dim=None):
     return uids, inverse.new_empty(uids.size(0)).scatter_(0, inverse, perm), inverse
 
 
+def neg_euclidean_distance(inner_product: Tensor, hq_sq_norm: Tensor, hd_sq_norm: Tensor) -> Tensor:
+    """Compute `-||q - d||` from `<q, d>`, `||q||^2` and `||d||^2`,
+    without materializing the broadcasted difference `q - d`.
+    The inputs must be in float32: the expansion suffers from cancellation in half precision."""
+    sq_dist = hq_sq_norm + hd_sq_norm - 2 * inner_product
+    return -1 * sq_dist.clamp(min=0).pow(0.5)
+
+
 class DprHead(Head):
     """Score question and document representations."""
 
@@ -204,20 +211,30 @@ class DprHead(Head):
         if shared_batch:
             hd = hd.view(-1, n_docs, vdim)
             if self.metric_type == MetricType.inner_product:
-                scores = einsum("bh, bdh -> bd", hq, hd)
+                scores = torch.bmm(hd, hq[:, :, None]).squeeze(-1)
             elif self.metric_type == MetricType.euclidean:
-                _hq = hq[:, None, :]
-                _hd = hd[:, :, :]
-                scores = -1 * (_hq - _hd).pow(2).sum(-1).pow(0.5)
+                # the norm expansion is not accurate in half precision: compute in float32
+                with torch.autocast(device_type=hq.device.type, enabled=False):
+                    _hq, _hd = hq.float(), hd.float()
+                    scores = torch.bmm(_hd, _hq[:, :, None]).squeeze(-1)
+                    hq_sq_norm = _hq.pow(2).sum(-1)[:, None]
+                    hd_sq_norm = _hd.pow(2).sum(-1)
+                    scores = neg_euclidean_distance(scores, hq_sq_norm, hd_sq_norm)
+                scores = scores.to(hq.dtype)
             else:
                 raise ValueError(f"Unknown `metric_type`: {self.metric_type}")
         else:
             if self.metric_type == MetricType.inner_product:
-                scores = einsum("bh, dh -> bd", hq, hd)
+                scores = hq @ hd.t()
             elif self.metric_type == MetricType.euclidean:
-                _hq = hq[:, None, :]
-                _hd = hd[None, :, :]
-                scores = -1 * (_hq - _hd).pow(2).sum(-1).pow(0.5)
+                # the norm expansion is not accurate in half precision: compute in float32
+                with torch.autocast(device_type=hq.device.type, enabled=False):
+                    _hq, _hd = hq.float(), hd.float()
+                    scores = _hq @ _hd.t()
+                    hq_sq_norm = _hq.pow(2).sum(-1)[:, None]
+                    hd_sq_norm = _hd.pow(2).sum(-1)[None, :]
+                    scores = neg_euclidean_distance(scores, hq_sq_norm, hd_sq_norm)
+                scores = scores.to(hq.dtype)
             else:
                 raise ValueError(f"Unknown `metric_type`: {self.metric_type}")
 
@@ -341,7 +341,7 @@ class Module(nn.Module, ABC):
     def _select_field(prefix: str, batch: Batch) -> Batch:
         """Select attributes with prefix `prefix` from the `batch`"""
         prefix = f"{prefix}."
-        return {k.replace(prefix, ""): v for k, v in batch.items() if str(k).startswith(prefix)}
+        return {k[len(prefix) :]: v for k, v in batch.items() if str(k).startswith(prefix)}
 
     def _check_batch_type(self, batch: Batch) -> None:
         """
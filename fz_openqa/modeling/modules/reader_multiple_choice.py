@@ -105,11 +105,11 @@ class ReaderMultipleChoice(Module):
         # todo: modify so each answer can be weighted differently,
         #  this is too much biased toward the answer
         #  edit: use the max instead of avg.
-        S_relevance, _ = torch.einsum("bdh, bah -> bda", h_relevance, ha).max(-1)
+        S_relevance, _ = torch.bmm(h_relevance, ha.transpose(1, 2)).max(-1)
 
         # answer-question final representation
         # dot-product model S(qd, a)
-        S_qda = torch.einsum("bdh, bah -> bda", heq, ha)
+        S_qda = torch.bmm(heq, ha.transpose(1, 2))
 
         return {"_answer_logits_": S_qda, "_relevance_logits_": S_relevance}
 
@@ -131,10 +131,9 @@ class ReaderMultipleChoice(Module):
 
         # select the logits of the answering model corresponding
         # to the positive document (relevance_target)
-        _index = relevance_targets.view(bs, 1, 1).clone()
-        _index = _index.expand(bs, 1, *output["_answer_logits_"].shape[2:])
-        answer_logits = output["_answer_logits_"]  # [bs, n_documents, n_options, hdim]
-        answer_logits = answer_logits.gather(dim=1, index=_index).squeeze(1)
+        answer_logits = output["_answer_logits_"]  # [bs, n_documents, n_options]
+        batch_idx = torch.arange(bs, device=answer_logits.device)
+        answer_logits = answer_logits[batch_idx, relevance_targets]
 
         # compute the reader loss
         answer_targets: Tensor = batch["answer.target"]
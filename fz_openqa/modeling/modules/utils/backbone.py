@@ -48,7 +48,7 @@ def extend_backbone_embeddings(backbone: PreTrainedModel, tokenizer: PreTrainedT
 def select_field_attributes(field: str, batch: Batch) -> Batch:
     """Select attributes with prefix `prefix` from the `batch`"""
     prefix = f"{field}."
-    return {k.replace(prefix, ""): v for k, v in batch.items() if str(k).startswith(prefix)}
+    return {k[len(prefix) :]: v for k, v in batch.items() if str(k).startswith(prefix)}
 
 
 def process_tokens_with_backbone(
@@ -87,13 +87,15 @@ def process_with_backbone(
     attention_mask = batch["attention_mask"][:, :max_length]
 
     # process data by chunk
-    output = None
     bs, seq_len = inputs_ids.shape
+    if bs == 0:
+        return None
     if max_batch_size is None:
         chunk_size = bs
     else:
         chunk_size = int(max_batch_size * (max_length / seq_len) ** 2)
 
+    chunks = []
     for i in range(0, bs, chunk_size):
         # process the chunk using BERT
         chunk = process_tokens_with_backbone(
@@ -102,9 +104,9 @@ def process_with_backbone(
             attention_mask[i : i + chunk_size],
             **kwargs,
         )
-        if output is None:
-            output = chunk
-        else:
-            output = torch.cat([output, chunk], dim=0)
+        chunks.append(chunk)
 
-    return output
+    # concatenate all chunks at once
+    if len(chunks) == 1:
+        return chunks[0]
+    return torch.cat(chunks, dim=0)
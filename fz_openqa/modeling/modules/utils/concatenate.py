@@ -1,4 +1,5 @@
 import warnings
+from typing import List
 
 import einops
 import torch
@@ -7,6 +8,12 @@ from warp_pipes import Batch
 from fz_openqa.modeling.functional import padless_cat
 
 
+def has_tokens_beyond(batch: Batch, *, fields: List[str], max_length: int) -> bool:
+    """Return True if any of the `fields` has non-padding tokens
+    (according to the attention mask) beyond `max_length`."""
+    return any(bool(batch[f"{field}.attention_mask"][..., max_length:].any()) for field in fields)
+
+
 def concat_questions_and_documents(batch: Batch, *, pad_token_id: int, max_length: int) -> Batch:
     """
     Concatenate the questions and the documents across the time dimension, and without padding.
@@ -63,18 +70,21 @@ def concat_questions_and_documents(batch: Batch, *, pad_token_id: int, max_lengt
         batch[key] = einops.rearrange(batch[key], "bs n_opts ... -> (bs n_opts) ...")
 
     # split documents and questions, remove the cls token
+    # and truncate each input to `max_length - 1` tokens (the cls token is added back),
+    # tokens beyond that length would be truncated after concatenation anyway.
     # todo: @andreas: not sure if we should remove the intermediate [SEP] and [DOC] tokens
+    is_truncated = has_tokens_beyond(batch, fields=fields, max_length=max_length)
     inputs = [
         {
-            "input_ids": batch["question.input_ids"][..., 1:],
-            "attention_mask": batch["question.attention_mask"][..., 1:],
+            "input_ids": batch["question.input_ids"][..., 1:max_length],
+            "attention_mask": batch["question.attention_mask"][..., 1:max_length],
         }
     ]
     for i in range(n_docs):
         inputs.append(
             {
-                "input_ids": batch["document.input_ids"][:, i, 1:],
-                "attention_mask": batch["document.attention_mask"][:, i, 1:],
+                "input_ids": batch["document.input_ids"][:, i, 1:max_length],
+                "attention_mask": batch["document.attention_mask"][:, i, 1:max_length],
             }
         )
 
@@ -93,7 +103,7 @@ def concat_questions_and_documents(batch: Batch, *, pad_token_id: int, max_lengt
 
     # truncate the inputs to the maximum length
     input_length = padded_batch["input_ids"].shape[-1]
-    if input_length > max_length:
+    if is_truncated or input_length > max_length:
         warnings.warn(f"the tensor [{'; '.join(fields)}] was truncated.")
         for key in ["input_ids", "attention_mask"]:
             padded_batch[key] = padded_batch[key][..., :max_length]
@@ -175,12 +185,15 @@ def stack_questions_and_documents(batch: Batch, *, pad_token_id: int, max_length
             n_opts=n_opts,
         )
 
-    # get the list of inputs and remove the cls token
+    # get the list of inputs, remove the cls token
+    # and truncate each input to `max_length - 1` tokens (the cls token is added back),
+    # tokens beyond that length would be truncated after concatenation anyway.
     # todo: @andreas: not sure if we should remove the intermediate [SEP] and [DOC] tokens
+    is_truncated = has_tokens_beyond(batch, fields=fields, max_length=max_length)
     inputs = [
         {
-            "input_ids": batch[f"{field}.input_ids"][..., 1:],
-            "attention_mask": batch[f"{field}.attention_mask"][..., 1:],
+            "input_ids": batch[f"{field}.input_ids"][..., 1:max_length],
+            "attention_mask": batch[f"{field}.attention_mask"][..., 1:max_length],
         }
         for field in fields
     ]
@@ -200,7 +213,7 @@ def stack_questions_and_documents(batch: Batch, *, pad_token_id: int, max_length
 
     # truncate the inputs to the maximum length
     input_length = padded_batch["input_ids"].shape[-1]
-    if input_length > max_length:
+    if is_truncated or input_length > max_length:
         warnings.warn(f"the tensor [{'; '.join(fields)}] was truncated.")
         for key in ["input_ids", "attention_mask"]:
             padded_batch[key] = padded_batch[key][..., :max_length]
@@ -21,8 +21,8 @@ def expand_and_flatten(batch: Batch, n_docs, *, keys: List[str]) -> Batch:
     output = {}
     for k in keys:
         v = batch[k]
-        v = v[:, None].expand(v.shape[0], n_docs, *v.shape[1:]).contiguous()
-        output[k] = v.view(-1, *v.shape[2:])
+        v = v[:, None].expand(v.shape[0], n_docs, *v.shape[1:])
+        output[k] = v.reshape(-1, *v.shape[2:])
     return output
 
 
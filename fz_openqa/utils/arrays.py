@@ -1,3 +1,4 @@
+from itertools import chain
 from typing import List
 from typing import Optional
 from typing import Union
@@ -15,12 +16,12 @@ def concat_arrays(*a: Array, dim=0) -> Array:
     assert all(isinstance(x, arr_type) for x in a)
     if arr_type == list:
         if dim == 0:
-            return sum(a, [])
+            return list(chain.from_iterable(a))
         elif dim == 1:
             new_array = []
             assert all(len(x) == len(a[0]) for x in a)
             for i in range(len(a[0])):
-                new_array.append(sum([x[i] for x in a], []))
+                new_array.append(list(chain.from_iterable(x[i] for x in a)))
             return new_array
     elif arr_type == np.ndarray:
         return np.concatenate(a, axis=dim)
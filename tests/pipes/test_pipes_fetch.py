@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from datasets import Dataset
+
+from fz_openqa.datamodules.pipes.fecth import FetchDocuments
+
+
+class TestFetchDocuments(TestCase):
+    def setUp(self) -> None:
+        n = 20
+        self.corpus = Dataset.from_dict(
+            {
+                "document.row_idx": list(range(n)),
+                "document.text": [f"document #{i}" for i in range(n)],
+            }
+        )
+
+    def test_fetch_documents(self):
+        """test that the rows are returned in the query order, including duplicates,
+        contiguous runs of indexes and scattered indexes"""
+        pipe = FetchDocuments(corpus_dataset=self.corpus, max_chunk_size=3)
+        indexes = [5, 2, 5, 17, 0, 3, 4, 11, 2]
+        output = pipe({"document.row_idx": indexes})
+
+        self.assertSequenceEqual(output["document.row_idx"], indexes)
+        self.assertSequenceEqual(output["document.text"], [f"document #{i}" for i in indexes])
+
+    def test_fetch_documents_negative_indexes(self):
+        """test that negative (padding) indexes are fetched similarly to `Dataset.__getitem__`"""
+        pipe = FetchDocuments(corpus_dataset=self.corpus, max_chunk_size=3)
+        indexes = [-1, 3, -1, 4, 5]
+        output = pipe({"document.row_idx": indexes})
+
+        expected = [i % len(self.corpus) for i in indexes]
+        self.assertSequenceEqual(output["document.row_idx"], expected)
+        self.assertSequenceEqual(output["document.text"], [f"document #{i}" for i in expected])
+
+    def test_fetch_documents_torch_format(self):
+        """test fetching rows with variable lengths from a torch-formatted corpus,
+        using both slices and lists of indexes across several chunks"""
+        input_ids = [list(range(1 + i % 4)) for i in range(len(self.corpus))]
+        corpus = self.corpus.add_column("document.input_ids", input_ids)
+        corpus = corpus.with_format("torch", columns=["document.row_idx", "document.input_ids"])
+        pipe = FetchDocuments(corpus_dataset=corpus, max_chunk_size=3, min_slice_length=3)
+        indexes = [12, 0, 4, 1, 2, 3, 9, 5, 6, 17, 4, 15]
+        output = pipe({"document.row_idx": indexes})
+
+        self.assertSequenceEqual([int(i) for i in output["document.row_idx"]], indexes)
+        self.assertSequenceEqual(
+            [x.tolist() for x in output["document.input_ids"]], [input_ids[i] for i in indexes]
+        )
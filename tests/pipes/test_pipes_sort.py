@@ -60,3 +60,28 @@ class TestSort(TestCase):
         pipe = Sort(keys=["a", "b"], reverse=True)
         output = pipe(batch)
         self.assertEqual(output['_index_'], [5, 6, 4, 3, 2, 1])
+
+    def test_sort_ties_and_non_numerical_keys(self):
+        """test that ties keep their original order and that non-numerical keys are supported"""
+        batch = {
+            "a": [True, False, True, False],
+            "b": [0.5, 0.5, 0.5, 1.0],
+            "_index_": [1, 2, 3, 4],
+        }
+        output = Sort(keys=["a", "b"], reverse=True)(deepcopy(batch))
+        self.assertEqual(output["_index_"], [1, 3, 4, 2])
+
+        batch = {"a": ["b", "c", "a"], "_index_": [1, 2, 3]}
+        output = Sort(keys=["a"], reverse=False)(deepcopy(batch))
+        self.assertEqual(output["_index_"], [3, 1, 2])
+
+    def test_sort_large_integers_and_tensors(self):
+        """test that large integer keys keep their order and that tensors requiring
+        gradients are supported"""
+        batch = {"a": [2**62 + 1, 2**62, 2**62 + 2], "_index_": [1, 2, 3]}
+        output = Sort(keys=["a"], reverse=True)(deepcopy(batch))
+        self.assertEqual(output["_index_"], [3, 1, 2])
+
+        batch = {"a": torch.tensor([0.1, 0.3, 0.2], requires_grad=True), "_index_": [1, 2, 3]}
+        output = Sort(keys=["a"], reverse=True)(batch)
+        self.assertEqual(output["_index_"], [2, 3, 1])